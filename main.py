@@ -6,17 +6,45 @@ A command-line application that enhances natural language with emojis
 using the Strands SDK.
 """
 
+import argparse
 import sys
+import threading
 from emoji_rephraser.terminal import TerminalInterface
-from emoji_rephraser.rephraser import EmojiRephraserAgent
 
 
-def main():
+def parse_args(argv=None):
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="emoji-rephraser",
+        description="Enhance text with emojis while preserving the original words."
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="read lines from stdin, rephrase them concurrently and print the results"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="maximum number of concurrent requests in batch mode (default: 8)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main entry point for the application."""
+    args = parse_args(argv)
+    if args.batch:
+        return run_batch(sys.stdin, args.concurrency)
+    
     terminal = TerminalInterface()
     terminal.display_welcome()
     
     try:
+        # Imported after the welcome screen is shown to keep startup fast
+        from emoji_rephraser.rephraser import EmojiRephraserAgent
+        
         # Initialize the rephraser agent
         terminal.display_message("Initializing emoji rephraser agent...")
         agent = EmojiRephraserAgent()
@@ -30,9 +58,7 @@ def main():
         terminal.display_error(f"An error occurred: {str(e)}")
         return 1
     finally:
-        # Use emoji only if terminal supports it
-        wave = "👋" if terminal.emoji_support else "!"
-        terminal.display_message(f"Thank you for using Emoji Rephraser! Goodbye{wave}")
+        terminal.display_goodbye()
     
     return 0
 
@@ -56,14 +82,114 @@ def run_conversation_loop(terminal, agent):
         
         # Process with agent
         try:
-            terminal.display_loading()
-            rephrased_text = agent.rephrase(user_input)
-            terminal.display_rephrasing(rephrased_text)
+            stream_rephrasing(terminal, agent, user_input)
         except KeyboardInterrupt:
             terminal.display_message("Rephrasing cancelled")
         except Exception as e:
             terminal.display_error(f"Rephrasing error: {str(e)}")
 
 
+def stream_rephrasing(terminal, agent, text):
+    """Rephrase text, displaying the response as it streams in.
+    
+    A loading spinner runs on a background thread until the first chunk
+    arrives. If validation changes the streamed text, the validated
+    rephrasing is displayed after it as a correction.
+    """
+    done = threading.Event()
+    spinner = threading.Thread(
+        target=terminal.display_loading_live,
+        args=(done,),
+        daemon=True
+    )
+    spinner.start()
+    
+    chunks = agent.rephrase_stream(text)
+    streamed = []
+    try:
+        while True:
+            try:
+                chunk = next(chunks)
+            except StopIteration as stop:
+                rephrased_text = stop.value
+                break
+            if not streamed:
+                chunk = chunk.lstrip()
+                if not chunk:
+                    continue
+                done.set()
+                spinner.join()
+                terminal.begin_stream()
+            terminal.write_chunk(chunk)
+            streamed.append(chunk)
+    finally:
+        done.set()
+        spinner.join()
+        chunks.close()
+    
+    if not streamed:
+        terminal.display_rephrasing(rephrased_text)
+        return
+    terminal.end_stream()
+    if "".join(streamed).strip() != rephrased_text:
+        terminal.display_correction(rephrased_text)
+
+
+def run_batch(stream, concurrency):
+    """Rephrase every non-empty line of a stream and print the results in order.
+    
+    Lines that fail to rephrase are printed unchanged and reported on stderr.
+    """
+    lines = [line.strip() for line in stream]
+    lines = [line for line in lines if line]
+    if not lines:
+        return 0
+    
+    try:
+        from emoji_rephraser.rephraser import EmojiRephraserAgent
+        agent = EmojiRephraserAgent()
+    except Exception as e:
+        print(f"An error occurred: {str(e)}", file=sys.stderr)
+        return 1
+    
+    # asyncio is imported here rather than at module level, since it is only
+    # needed in batch mode and noticeably slows down interactive startup
+    import asyncio
+    
+    # Prefer the libuv-based event loop when available (not supported on Windows)
+    try:
+        import uvloop
+        run = uvloop.run
+    except ImportError:
+        run = asyncio.run
+    results = run(_run_batch(agent, lines, concurrency))
+    
+    exit_code = 0
+    for line, result in zip(lines, results):
+        if isinstance(result, Exception):
+            print(f"Rephrasing error for {line!r}: {str(result)}", file=sys.stderr)
+            print(line)
+            exit_code = 1
+        else:
+            print(result)
+    return exit_code
+
+
+async def _run_batch(agent, lines, concurrency):
+    """Rephrase lines concurrently, with at most `concurrency` requests in flight."""
+    import asyncio
+    
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    
+    async def rephrase_line(line):
+        async with semaphore:
+            return await agent.arephrase(line)
+    
+    return await asyncio.gather(
+        *(rephrase_line(line) for line in lines),
+        return_exceptions=True
+    )
+
+
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
@@ -4,10 +4,19 @@ Emoji Rephraser Agent
 Uses Strands SDK to enhance text with emojis while preserving the original words.
 """
 
+import os
+import re
+import copy
+import hashlib
 import time
+import sqlite3
+import asyncio
+import importlib.util
 import logging
-from typing import Optional, Dict, Any
-from strands.models import BedrockModel  
+import threading
+from functools import lru_cache
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple, Generator, FrozenSet, Callable, Awaitable
 
 # Configure logging
 logging.basicConfig(
@@ -16,16 +25,177 @@ logging.basicConfig(
 )
 logger = logging.getLogger("emoji_rephraser")
 
-# Try to import Strands SDK
-try:
-    from strands import Agent
-    STRANDS_AVAILABLE = True
-except ImportError:
-    STRANDS_AVAILABLE = False
+# Check for the Strands SDK without importing it; it pulls in boto3/botocore,
+# which is slow, so it is only imported once the agent is initialized
+STRANDS_AVAILABLE = importlib.util.find_spec("strands") is not None
+if not STRANDS_AVAILABLE:
     logger.warning(
         "Strands SDK not found. Please install it using: uv pip install strands-agents"
     )
 
+# Bedrock client settings: keep connections alive and pooled so retries and
+# concurrent batch requests reuse them instead of repeating the TLS handshake
+_BOTOCORE_CONFIG_OPTIONS = {
+    "retries": {"max_attempts": 5, "mode": "adaptive"},
+    "tcp_keepalive": True,
+    "max_pool_connections": 10,
+}
+
+# NumPy is optional and imported lazily. Its emoji scan only beats the regex on
+# long strings (break-even around 700 characters; ~25us vs ~2us at 45 characters),
+# so it is used from this length up
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+_NUMPY_SCAN_MIN_LENGTH = 1024
+
+# Precompiled patterns used on every rephrase
+_EMOJI_RE = re.compile(r'[\U0001F000-\U0001FAFF\u2300-\u23FF\u2600-\u27BF\u2B00-\u2BFF]+')
+# Emojis plus the symbols models use like emojis (arrows, clocks, keycaps) and the
+# zero-width joiners and variation selectors that combine them
+_EMOJI_SEQUENCE_RE = re.compile(
+    r'[\U0001F000-\U0001FAFF\u2600-\u27BF\u2B00-\u2BFF\u2190-\u21FF\u2300-\u23FF\u20E3\u200d\ufe0f]+'
+)
+# Typographic punctuation that models substitute for what the user typed
+_PUNCTUATION_TABLE = str.maketrans({'\u2018': "'", '\u2019': "'", '\u2026': '...'})
+_WORD_SPLIT_RE = re.compile(r'[\s.,!?;:"\'\(\)\[\]]')
+_TEMPLATE_WORD_RE = re.compile(r"[A-Za-z][A-Za-z']*")
+_TEMPLATE_SLOT_RE = re.compile(r"<SLOT_(\d+)>")
+
+# Config keys that shape generated responses; persisted responses are only
+# reused under the same values
+_GENERATION_CONFIG_KEYS = ("system_prompt", "model_id", "fast_model_id", "temperature", "max_tokens")
+
+# Potentially negative or inappropriate emojis, stripped from responses in one pass.
+# A literal alternation regex is used rather than str.translate: '☠️' spans two code
+# points (the second is a variation selector shared with other emojis), and translate
+# is several times slower than re.subn on non-ASCII text.
+_NEGATIVE_EMOJIS = ('💀', '☠️', '🤬', '💩', '🤮', '🤢', '😡')
+_NEG_RE = re.compile('|'.join(map(re.escape, _NEGATIVE_EMOJIS)))
+# Leading parts of multi-code-point negative emojis, held back while streaming
+# until the next chunk shows whether the emoji is completed
+_NEGATIVE_PREFIXES = frozenset(e[:i] for e in _NEGATIVE_EMOJIS for i in range(1, len(e)))
+_NEGATIVE_PREFIX_MAX_LEN = max(len(e) for e in _NEGATIVE_EMOJIS) - 1
+
+# Words that form the fixed skeleton of a template; every other word becomes a slot
+_TEMPLATE_FIXED_WORDS = frozenset({
+    "i", "me", "my", "we", "us", "our", "you", "your", "he", "him", "his", "she", "her",
+    "it", "its", "they", "them", "their", "this", "that", "these", "those",
+    "a", "an", "the", "and", "or", "but", "so", "not", "no", "yes",
+    "am", "is", "are", "was", "were", "be", "been", "do", "does", "did", "have", "has", "had",
+    "will", "would", "can", "could", "should", "to", "of", "in", "on", "at", "for", "with",
+    "from", "about", "by", "very", "really", "too", "just", "today", "tonight", "tomorrow",
+    "love", "loves", "hate", "hates", "like", "likes", "want", "wants", "need", "needs",
+    "enjoy", "enjoys", "miss", "misses", "going", "go", "feel", "feels",
+})
+
+
+@lru_cache(maxsize=512)
+def _template_key(text: str) -> Tuple[str, Tuple[str, ...]]:
+    """Split text into a structural skeleton and its slot values.
+    
+    Function words and common verbs are kept as written in the skeleton, so
+    the fixed words of a reused response match the input's casing; all other
+    words are replaced with numbered ``<SLOT_i>`` placeholders. For example,
+    "I love pizza" becomes ("I love <SLOT_0>", ("pizza",)).
+    
+    Args:
+        text: The text to split
+        
+    Returns:
+        Tuple of (skeleton, slot values in order of appearance)
+    """
+    slots: List[str] = []
+    
+    def _replace(match: "re.Match[str]") -> str:
+        word = match.group(0)
+        if word.lower() in _TEMPLATE_FIXED_WORDS:
+            return word
+        slots.append(word)
+        return f"<SLOT_{len(slots) - 1}>"
+    
+    skeleton = _TEMPLATE_WORD_RE.sub(_replace, text.strip())
+    return skeleton, tuple(slots)
+
+
+def _split_words(text: str) -> Tuple[str, ...]:
+    """Split text into words on whitespace, common punctuation and emojis, keeping case.
+    
+    Emojis are often glued to words ("pizza🍕"), so they are blanked out
+    before splitting, and curly quotes and ellipses are mapped to the ASCII
+    characters they stand for.
+    """
+    words_only = _EMOJI_SEQUENCE_RE.sub(' ', text.translate(_PUNCTUATION_TABLE))
+    return tuple(w for w in _WORD_SPLIT_RE.split(words_only) if w)
+
+
+@lru_cache(maxsize=512)
+def _tokenize_original(text: str) -> Tuple[str, ...]:
+    """Split text into lowercase words, the same way as responses are split."""
+    return _split_words(text.lower())
+
+
+def _filter_negative_emojis(buffer: str) -> Tuple[str, str]:
+    """Remove negative emojis from streamed text, holding back a partial one.
+    
+    A negative emoji such as '☠️' can be split across stream chunks, so a
+    trailing part of one is returned separately, to be prepended to the next
+    chunk instead of being displayed.
+    
+    Args:
+        buffer: The held back text followed by the newly streamed chunk
+        
+    Returns:
+        Tuple of (text safe to display, text held back)
+    """
+    buffer = _NEG_RE.sub('', buffer)
+    for size in range(min(len(buffer), _NEGATIVE_PREFIX_MAX_LEN), 0, -1):
+        if buffer[-size:] in _NEGATIVE_PREFIXES:
+            return buffer[:-size], buffer[-size:]
+    return buffer, ''
+
+
+async def _next_event(events: Any) -> Any:
+    """Await the next event of an async stream (the ``anext`` builtin needs Python 3.10)."""
+    return await events.__anext__()
+
+
+def _emoji_mask(text: str) -> Any:
+    """Return a boolean array marking which code points of text are emojis.
+    
+    Uses the same code point ranges as ``_EMOJI_RE``.
+    """
+    import numpy as np
+    
+    cps = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    return (
+        ((cps >= 0x1F000) & (cps <= 0x1FAFF))
+        | ((cps >= 0x2300) & (cps <= 0x23FF))
+        | ((cps >= 0x2600) & (cps <= 0x27BF))
+        | ((cps >= 0x2B00) & (cps <= 0x2BFF))
+    )
+
+
+def _count_emojis(text: str) -> int:
+    """Count the runs of consecutive emojis in text (same as ``len(_EMOJI_RE.findall(text))``)."""
+    if not NUMPY_AVAILABLE or len(text) < _NUMPY_SCAN_MIN_LENGTH:
+        return len(_EMOJI_RE.findall(text))
+    import numpy as np
+    
+    mask = _emoji_mask(text)
+    # Each run starts where the mask rises from False to True
+    return int(np.count_nonzero(np.diff(mask.astype(np.int8), prepend=0) == 1))
+
+
+def _extract_emojis(text: str) -> List[str]:
+    """Extract runs of consecutive emojis from text (same as ``_EMOJI_RE.findall(text)``)."""
+    if not NUMPY_AVAILABLE or len(text) < _NUMPY_SCAN_MIN_LENGTH:
+        return _EMOJI_RE.findall(text)
+    import numpy as np
+    
+    mask = _emoji_mask(text)
+    edges = np.flatnonzero(np.diff(mask.astype(np.int8), prepend=0, append=0))
+    # Edges alternate between run starts and run ends
+    return [text[start:end] for start, end in zip(edges[::2], edges[1::2])]
+
 
 class EmojiRephraserAgent:
     """Agent that enhances text with emojis while preserving the original words."""
@@ -46,7 +216,7 @@ class EmojiRephraserAgent:
             )
         
         # Default configuration
-        self.agent_config = {
+        self.agent_config: Dict[str, Any] = {
             "system_prompt": (
                 "You are an emoji rephraser. Your job is to enhance user input with relevant emojis "
                 "while preserving all the original words. Add emojis before or after relevant words "
@@ -56,17 +226,49 @@ class EmojiRephraserAgent:
                 "Be creative but relevant with emoji choices."
             ),
             "temperature": 0.7,  # Higher temperature for more creative outputs
+            "model_id": "anthropic.claude-3-5-sonnet-20241022-v2:0",
+            # Faster model used for short, simple inputs (None to always use model_id)
+            "fast_model_id": "anthropic.claude-3-5-haiku-20241022-v1:0",
+            "max_tokens": None,  # Output token cap; None sizes it from the input length
+            "cache_size": 512,  # Maximum number of rephrasings kept in the response cache
+            "semantic_cache": False,  # Reuse responses for near-duplicate inputs (needs sentence-transformers)
+            "semantic_threshold": 0.92,  # Minimum cosine similarity for a semantic cache hit
+            "embedding_model": "sentence-transformers/all-MiniLM-L6-v2",
+            "template_cache": False,  # Reuse responses for inputs with the same sentence structure
+            # SQLite file persisting the response cache across sessions (None to disable)
+            "cache_path": os.path.join(os.path.expanduser("~"), ".cache", "emoji_rephraser", "cache.db"),
+            "cache_ttl": 7 * 24 * 3600,  # Seconds before a persisted response expires
         }
         
         # Override with user-provided config if any
         if config:
             self.agent_config.update(config)
         
+        # LRU cache of validated responses keyed by stripped input text
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._config_hash = self._generation_config_hash()
+        if self.agent_config["cache_path"]:
+            self._open_cache_db(os.path.expanduser(self.agent_config["cache_path"]))
+        
+        # Semantic cache: normalized query embeddings (N x D) with parallel text/response lists
+        self._embedder: Any = None
+        self._emb_index: Any = None
+        self._emb_texts: List[str] = []
+        self._emb_responses: List[str] = []
+        if self.agent_config["semantic_cache"]:
+            self._load_embedder()
+        
+        # Template cache: skeleton -> response with <SLOT_i> placeholders
+        self._templates: "OrderedDict[str, str]" = OrderedDict()
+        
         # Initialize Strands agent with retry logic
-        self.agent = None
+        self.model: Any = None
+        self._fast_model: Any = None
         self._initialize_agent()
     
-    def _initialize_agent(self, max_retries: int = 3, retry_delay: float = 1.0):
+    def _initialize_agent(self, max_retries: int = 3, retry_delay: float = 1.0) -> None:
         """Initialize the Strands agent with retry logic.
         
         Args:
@@ -76,6 +278,9 @@ class EmojiRephraserAgent:
         Raises:
             ConnectionError: If all connection attempts fail
         """
+        from botocore.config import Config
+        from strands.models import BedrockModel
+        
         retries = 0
         last_error = None
         
@@ -83,17 +288,24 @@ class EmojiRephraserAgent:
             try:  
                 logger.info(f"Initializing Strands agent (attempt {retries + 1}/{max_retries})")  
                 
-                # Create model with temperature configuration  
-                model = BedrockModel(
-                    model_id="anthropic.claude-3-5-sonnet-20241022-v2:0",
-                    region_name="us-west-2",
-                    temperature=self.agent_config["temperature"]
-                )  
+                # Create model with temperature configuration once; its boto client
+                # (and connection pool) is reused if a later step has to be retried
+                if self.model is None:
+                    self.model = BedrockModel(
+                        model_id=self.agent_config["model_id"],
+                        region_name="us-west-2",
+                        temperature=self.agent_config["temperature"],
+                        boto_client_config=Config(**_BOTOCORE_CONFIG_OPTIONS)
+                    )  
+                if self._fast_model is None and self.agent_config["fast_model_id"]:
+                    self._fast_model = BedrockModel(
+                        model_id=self.agent_config["fast_model_id"],
+                        region_name="us-west-2",
+                        temperature=self.agent_config["temperature"],
+                        boto_client_config=Config(**_BOTOCORE_CONFIG_OPTIONS)
+                    )
                 
-                self.agent = Agent(  
-                    model=model,  
-                    system_prompt=self.agent_config["system_prompt"]  
-                )  
+                # Agents are created per call over these models (see _create_agent)
                 logger.info("✅ Emoji Rephraser Agent initialized successfully")  
                 return  
             except Exception as e:  
@@ -125,85 +337,678 @@ class EmojiRephraserAgent:
         if not text:
             return text  # Return original text if empty
         
-        if not self.agent:
-            try:
-                self._initialize_agent()
-            except ConnectionError as e:
-                raise RuntimeError(f"Agent unavailable: {str(e)}")
+        cache_key = self._cache_key(text)
+        cached, embedding = self._cached_response(text, cache_key)
+        if cached is not None:
+            return cached
+        
+        self._ensure_agent()
         
         try:
             # Prepare the prompt for rephrasing with emojis
-            prompt = f"Enhance this text with emojis while preserving all original words: {text}"
+            prompt = self._build_prompt(text)
             
             # Use Strands agent to rephrase text with emojis
             logger.debug(f"Sending rephrasing request: {text}")
             
             # Based on the Strands documentation, we can call the agent directly as a function
             logger.info("Calling agent directly as a function")
-            response = self.agent(prompt)
+            return self._rephrase_with(
+                text, self._select_model(text), cache_key, embedding,
+                lambda agent: agent(prompt)
+            )
+        except Exception as e:
+            error_msg = f"Rephrasing failed: {str(e)}"
+            logger.error(error_msg)
+            raise RuntimeError(error_msg)
+    
+    async def arephrase(self, text: str) -> str:
+        """Asynchronously enhance text with emojis while preserving the original words.
+        
+        Each call uses its own Strands agent over the shared model, so several
+        calls can be awaited concurrently (e.g. with ``asyncio.gather``) without
+        sharing conversation state.
+        
+        Args:
+            text: The text to enhance with emojis
             
-            # Extract text from response
-            response_text = str(response)
-                
-            logger.info(f"Response received: {response_text}")
+        Returns:
+            The original text enhanced with emojis
             
-            # If response is empty, return the original text
-            if not response_text or not response_text.strip():
-                logger.warning("Received empty rephrasing response")
-                return text
+        Raises:
+            RuntimeError: If rephrasing fails
+        """
+        if not text:
+            return text  # Return original text if empty
+        
+        cache_key = self._cache_key(text)
+        cached, embedding = self._cached_response(text, cache_key)
+        if cached is not None:
+            return cached
+        
+        self._ensure_agent()
+        
+        try:
+            prompt = self._build_prompt(text)
             
-            # Validate the response quality
-            validated_response = self._validate_response(text, response_text.strip())
+            logger.debug(f"Sending rephrasing request: {text}")
+            logger.info("Calling agent asynchronously")
+            return await self._arephrase_with(
+                text, self._select_model(text), cache_key, embedding,
+                lambda agent: agent.invoke_async(prompt)
+            )
+        except Exception as e:
+            error_msg = f"Rephrasing failed: {str(e)}"
+            logger.error(error_msg)
+            raise RuntimeError(error_msg)
+    
+    def rephrase_stream(self, text: str) -> Generator[str, None, str]:
+        """Enhance text with emojis, yielding the response as it is generated.
+        
+        Negative emojis are removed from chunks as they stream; the rest of the
+        validation runs once the full response has arrived. The validated text
+        is the generator's return value, and it may differ from the streamed
+        text (e.g. if the response was rejected).
+        A cached response, or one from the fast model, is yielded as a single
+        chunk once validated.
+        
+        Args:
+            text: The text to enhance with emojis
+            
+        Yields:
+            Response text chunks as they arrive
+            
+        Returns:
+            The validated response
+            
+        Raises:
+            RuntimeError: If rephrasing fails
+        """
+        if not text:
+            return text  # Return original text if empty
+        
+        cache_key = self._cache_key(text)
+        cached, embedding = self._cached_response(text, cache_key)
+        if cached is not None:
+            yield cached
+            return cached
+        
+        self._ensure_agent()
+        
+        prompt = self._build_prompt(text)
+        logger.debug(f"Sending rephrasing request: {text}")
+        logger.info("Streaming agent response")
+        
+        model = self._select_model(text)
+        if model is not self.model:
+            # Simple inputs are short, so the fast model's answer is returned
+            # whole once validated instead of being streamed
+            try:
+                validated_response = self._rephrase_with(
+                    text, model, cache_key, embedding, lambda agent: agent(prompt)
+                )
+            except Exception as e:
+                error_msg = f"Rephrasing failed: {str(e)}"
+                logger.error(error_msg)
+                raise RuntimeError(error_msg)
+            yield validated_response
             return validated_response
+        
+        # Drive Strands' async event stream from this synchronous generator
+        loop = asyncio.new_event_loop()
+        events = self._create_agent(text).stream_async(prompt)
+        chunks = []
+        held = ''
+        step = None
+        try:
+            while True:
+                step = loop.create_task(_next_event(events))
+                try:
+                    event = loop.run_until_complete(step)
+                except StopAsyncIteration:
+                    break
+                chunk = event.get("data")
+                if chunk:
+                    chunks.append(chunk)
+                    safe, held = _filter_negative_emojis(held + chunk)
+                    if safe:
+                        yield safe
+            if held:
+                yield held
         except Exception as e:
             error_msg = f"Rephrasing failed: {str(e)}"
             logger.error(error_msg)
             raise RuntimeError(error_msg)
+        finally:
+            if step is not None and not step.done():
+                # Interrupted (e.g. by Ctrl+C) mid-step: the stream cannot be closed
+                # while it is running, so cancel the step and let it unwind first
+                step.cancel()
+                try:
+                    loop.run_until_complete(step)
+                except (asyncio.CancelledError, Exception):
+                    pass
+            loop.run_until_complete(events.aclose())
+            loop.close()
+        
+        return self._process_response(text, "".join(chunks), cache_key, embedding)
     
-    def _validate_response(self, original_text: str, response: str) -> str:
-        """Validate the response quality to ensure it's appropriate for users.
+    def _rephrase_with(
+        self, text: str, model: Any, cache_key: str, embedding: Any,
+        invoke: Callable[[Any], Any]
+    ) -> str:
+        """Run text through the selected model, falling back to the main model.
+        
+        A fast model response that raises, comes back empty or fails validation
+        is discarded and the request is retried with the main model.
         
         Args:
-            original_text: The original text input by the user
-            response: The response from the agent
+            text: The text to rephrase
+            model: The model picked by _select_model
+            cache_key: Normalized cache key of the text
+            embedding: Normalized embedding of the text, or None
+            invoke: Callable that sends the prompt to an agent and returns its result
+            
+        Returns:
+            The validated response
+        """
+        if model is not self.model:
+            try:
+                response = invoke(self._create_agent(text, model))
+            except Exception as e:
+                logger.warning(f"Fast model call failed ({e}); retrying with the main model")
+            else:
+                validated_response = self._process_fast_response(text, response, cache_key, embedding)
+                if validated_response is not None:
+                    return validated_response
+        
+        response = invoke(self._create_agent(text))
+        return self._process_response(text, response, cache_key, embedding)
+    
+    async def _arephrase_with(
+        self, text: str, model: Any, cache_key: str, embedding: Any,
+        invoke: Callable[[Any], Awaitable[Any]]
+    ) -> str:
+        """Asynchronous counterpart of _rephrase_with for an awaitable invoke."""
+        if model is not self.model:
+            try:
+                response = await invoke(self._create_agent(text, model))
+            except Exception as e:
+                logger.warning(f"Fast model call failed ({e}); retrying with the main model")
+            else:
+                validated_response = self._process_fast_response(text, response, cache_key, embedding)
+                if validated_response is not None:
+                    return validated_response
+        
+        response = await invoke(self._create_agent(text))
+        return self._process_response(text, response, cache_key, embedding)
+    
+    def _ensure_agent(self) -> None:
+        """Initialize the models if they are not available.
+        
+        Raises:
+            RuntimeError: If the agent cannot be initialized
+        """
+        if self.model is None:
+            try:
+                self._initialize_agent()
+            except ConnectionError as e:
+                raise RuntimeError(f"Agent unavailable: {str(e)}")
+    
+    def _create_agent(self, text: str, model: Any = None) -> Any:
+        """Create a standalone Strands agent over a shared model.
+        
+        The agent has no callback handler, so it does not print to stdout, and
+        its output is capped at the token budget for the given text.
+        
+        Args:
+            text: The text the agent will rephrase
+            model: The model to use; defaults to the main model
+        """
+        from strands import Agent
+        
+        # Shallow copy so the per-call config does not leak into concurrent
+        # calls, while the boto client and its connection pool stay shared
+        model = copy.copy(model or self.model)
+        model.config = dict(model.get_config(), max_tokens=self._max_tokens(text))
+        
+        return Agent(
+            model=model,
+            system_prompt=self.agent_config["system_prompt"],
+            callback_handler=None
+        )
+    
+    def _select_model(self, text: str) -> Any:
+        """Pick the fast model for simple inputs and the main model otherwise."""
+        if self._fast_model is not None and self._is_simple(text):
+            logger.info("Routing simple input to the fast model")
+            return self._fast_model
+        return self.model
+    
+    @staticmethod
+    def _is_simple(text: str) -> bool:
+        """Check whether text is short enough to be handled by the fast model."""
+        return len(text) < 80 and text.count('.') <= 1
+    
+    def _max_tokens(self, text: str) -> int:
+        """Return the output token cap for rephrasing text.
+        
+        The response is the input plus a few emojis, so the cap scales with the
+        input length instead of using the model's much larger default.
+        """
+        if self.agent_config["max_tokens"]:
+            return self.agent_config["max_tokens"]
+        # One token per character leaves room for emojis (2-3 tokens each) and for
+        # scripts without spaces, where word counts underestimate the length
+        return min(1024, len(text) + 64)
+    
+    @staticmethod
+    def _build_prompt(text: str) -> str:
+        """Build the rephrasing prompt for the given text."""
+        return f"Enhance this text with emojis while preserving all original words: {text}"
+    
+    def _cached_response(self, text: str, cache_key: str) -> Tuple[Optional[str], Any]:
+        """Look up text in the exact, semantic and template caches, in that order.
+        
+        The text is only embedded after an exact cache miss, so exact hits do
+        not pay for the embedding model.
+        
+        Args:
+            text: The text being rephrased
+            cache_key: Normalized cache key of the text
+            
+        Returns:
+            Tuple of (cached response or None on a miss, normalized embedding of
+            the text or None if it was not computed)
+        """
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logger.info("Returning cached rephrasing")
+            return cached, None
+        
+        embedding = self._embed(text)
+        cached = self._semantic_get(text, embedding)
+        if cached is not None:
+            logger.info("Returning semantically cached rephrasing")
+            self._cache_put(cache_key, cached)
+            return cached, embedding
+        
+        cached = self._template_get(text)
+        if cached is not None:
+            logger.info("Returning rephrasing synthesized from a cached template")
+            self._cache_put(cache_key, cached)
+            return cached, embedding
+        
+        return None, embedding
+    
+    def _process_response(self, text: str, response: Any, cache_key: str, embedding: Any) -> str:
+        """Validate an agent response and store it in the caches.
+        
+        Args:
+            text: The text that was rephrased
+            response: The raw agent result
+            cache_key: Normalized cache key of the text
+            embedding: Normalized embedding of the text, or None
             
         Returns:
-            Validated response or original text with basic emojis if validation fails
+            The validated response, or the original text (with a basic emoji if
+            validation failed) if the response is empty or rejected
         """
-        import re
+        # Extract text from response
+        response_text = str(response).strip()
+            
+        logger.info(f"Response received: {response_text}")
+        
+        # If response is empty, return the original text
+        if not response_text:
+            logger.warning("Received empty rephrasing response")
+            return text
+        
+        # Validate the response quality; only responses that pass are cached
+        validated_response = self._check_response(text, response_text)
+        if validated_response is None:
+            return text + " 👍"  # Return original with basic emoji
+        self._store_response(text, cache_key, embedding, validated_response)
+        return validated_response
+    
+    def _process_fast_response(
+        self, text: str, response: Any, cache_key: str, embedding: Any
+    ) -> Optional[str]:
+        """Validate a fast model response and store it in the caches if it passes.
+        
+        Unlike _process_response, a rejected response yields None instead of
+        the original text, so the request can be retried with the main model.
         
-        # Check if response is too short
-        if len(response) < len(original_text) / 2:
-            logger.warning(f"Response too short: {response}")
-            return original_text + " 👍"  # Return original with basic emoji
+        Args:
+            text: The text that was rephrased
+            response: The raw agent result
+            cache_key: Normalized cache key of the text
+            embedding: Normalized embedding of the text, or None
             
-        # Check if all original words are preserved
-        # Split by common word boundaries and remove empty strings
-        original_words = [w.lower() for w in re.split(r'[\s.,!?;:"\'\(\)\[\]]', original_text) if w]
+        Returns:
+            The validated response, or None if it is empty or fails validation
+        """
+        response_text = str(response).strip()
+        logger.info(f"Fast model response received: {response_text}")
+        if not response_text:
+            logger.warning("Received empty rephrasing response")
+            return None
+        
+        validated_response = self._check_response(text, response_text)
+        if validated_response is None:
+            logger.warning("Fast model response failed validation; retrying with the main model")
+            return None
+        self._store_response(text, cache_key, embedding, validated_response)
+        return validated_response
+    
+    def _store_response(self, text: str, cache_key: str, embedding: Any, response: str) -> None:
+        """Store a validated response in the exact, semantic and template caches."""
+        self._cache_put(cache_key, response)
+        self._semantic_put(text, embedding, response)
+        self._template_put(text, response)
+    
+    @staticmethod
+    def _cache_key(text: str) -> str:
+        """Normalize input text into a response cache key.
         
-        # Check if each original word is in the response (case insensitive)
-        response_lower = response.lower()
+        Case is kept, since responses preserve the casing of the input words.
+        """
+        return text.strip()
+    
+    def _generation_config_hash(self) -> str:
+        """Hash the config values that shape responses, to scope persisted entries."""
+        values = tuple(self.agent_config[k] for k in _GENERATION_CONFIG_KEYS)
+        return hashlib.sha256(repr(values).encode("utf-8")).hexdigest()
+    
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Look up a cached response, marking it as most recently used.
+        
+        Args:
+            key: Normalized cache key
             
-        # Check if response has at least one emoji
-        emoji_pattern = r'[\U0001F000-\U0001F9FF\u2600-\u26FF\u2700-\u27BF]+'
-        emojis = re.findall(emoji_pattern, response)
+        Returns:
+            The cached response, or None on a miss
+        """
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            if self._db is None:
+                return None
+            
+            # Fall back to the persistent cache and promote hits into memory
+            try:
+                row = self._db.execute(
+                    "SELECT response FROM responses WHERE key = ? AND config = ?",
+                    (key, self._config_hash)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Response cache lookup failed: {str(e)}")
+                return None
+            if row is None:
+                return None
+            self._remember(key, row[0])
+            return row[0]
+    
+    def _cache_put(self, key: str, response: str) -> None:
+        """Store a validated response in memory and in the persistent cache.
+        
+        Args:
+            key: Normalized cache key
+            response: The validated response to cache
+        """
+        with self._cache_lock:
+            self._remember(key, response)
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, config, response, ts) VALUES (?, ?, ?, ?)",
+                    (key, self._config_hash, response, time.time())
+                )
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to persist response: {str(e)}")
+    
+    def _remember(self, key: str, response: str) -> None:
+        """Add a response to the in-memory LRU, evicting the least recently used entry if full.
         
-        if not emojis:
-            logger.warning("Response doesn't contain any emojis")
-            return original_text + " 👍"  # Return original with basic emoji
+        Must be called with the cache lock held.
+        """
+        maxsize = self.agent_config["cache_size"]
+        if maxsize <= 0:
+            return
+        self._cache[key] = response
+        self._cache.move_to_end(key)
+        while len(self._cache) > maxsize:
+            self._cache.popitem(last=False)
+    
+    def _open_cache_db(self, path: str) -> None:
+        """Open the persistent response cache and drop expired entries.
         
-        # Check for potentially negative or inappropriate emojis
-        negative_emojis = ['💀', '☠️', '🤬', '💩', '🤮', '🤢', '😡']
-        for emoji in negative_emojis:
-            if emoji in response:
-                logger.warning(f"Response contains potentially negative emoji: {emoji}")
-                # Replace the negative emoji with a more positive one
-                response = response.replace(emoji, '')
+        Persistence is disabled with a warning if the database cannot be opened.
         
-        # Check for excessive emojis (more than 1 emoji per 3 words)
+        Args:
+            path: Path of the SQLite database file
+        """
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            # Autocommit mode; access is serialized by the cache lock
+            db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            # Entries are scoped by a hash of the generation config, so a changed
+            # prompt, model or temperature does not serve stale responses
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT, config TEXT, response TEXT, ts REAL, PRIMARY KEY (key, config))"
+            )
+            db.execute(
+                "DELETE FROM responses WHERE ts < ?",
+                (time.time() - self.agent_config["cache_ttl"],)
+            )
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Response cache persistence disabled: {str(e)}")
+            return
+        self._db = db
+    
+    def _load_embedder(self) -> None:
+        """Load the sentence embedding model used by the semantic cache.
+        
+        Raises:
+            ImportError: If sentence-transformers or numpy is not installed
+        """
+        try:
+            from sentence_transformers import SentenceTransformer
+            import numpy  # noqa: F401
+        except ImportError:
+            raise ImportError(
+                "Semantic cache requires sentence-transformers. "
+                "Please install it using: uv pip install 'emoji_rephraser[semantic]'"
+            )
+        
+        logger.info(f"Loading embedding model {self.agent_config['embedding_model']}")
+        self._embedder = SentenceTransformer(self.agent_config["embedding_model"])
+    
+    def _embed(self, text: str) -> Any:
+        """Embed text for the semantic cache.
+        
+        Args:
+            text: The text to embed
+            
+        Returns:
+            A unit-length float32 vector, or None if the semantic cache is disabled
+        """
+        if self._embedder is None:
+            return None
+        return self._embedder.encode(text, normalize_embeddings=True).astype("float32")
+    
+    def _semantic_get(self, text: str, embedding: Any) -> Optional[str]:
+        """Find a cached response for a near-duplicate of the given text.
+        
+        A stored response is only reused if its words are exactly the words of
+        the new text, in the same order and case, so a hit neither drops,
+        reorders nor recases words the user wrote, nor adds any.
+        
+        Args:
+            text: The text being rephrased
+            embedding: Normalized embedding of the text
+            
+        Returns:
+            The cached response, or None on a miss
+        """
+        if embedding is None:
+            return None
+        with self._cache_lock:
+            if self._emb_index is None:
+                return None
+            # Embeddings are normalized, so the dot product is the cosine similarity
+            sims = self._emb_index @ embedding
+            # Candidates above the threshold, most similar first
+            candidates = [
+                (float(sims[i]), self._emb_texts[i], self._emb_responses[i])
+                for i in sims.argsort()[::-1]
+                if sims[i] >= self.agent_config["semantic_threshold"]
+            ]
+        
+        text_words = _split_words(text)
+        for similarity, matched_text, response in candidates:
+            if _split_words(response) == text_words:
+                logger.debug(f"Semantic cache hit for {text!r} (matched {matched_text!r}, similarity {similarity:.3f})")
+                return response
+        return None
+    
+    def _semantic_put(self, text: str, embedding: Any, response: str) -> None:
+        """Add a validated response to the semantic cache, evicting the oldest entry if full.
+        
+        Args:
+            text: The text that was rephrased
+            embedding: Normalized embedding of the text
+            response: The validated response to cache
+        """
+        if embedding is None:
+            return
+        import numpy as np
+        
+        maxsize = self.agent_config["cache_size"]
+        if maxsize <= 0:
+            return
+        with self._cache_lock:
+            if self._emb_index is None:
+                self._emb_index = embedding[np.newaxis, :]
+            else:
+                self._emb_index = np.vstack((self._emb_index, embedding))
+            self._emb_texts.append(text)
+            self._emb_responses.append(response)
+            if len(self._emb_texts) > maxsize:
+                self._emb_index = self._emb_index[1:]
+                del self._emb_texts[0]
+                del self._emb_responses[0]
+    
+    def _template_get(self, text: str) -> Optional[str]:
+        """Synthesize a response from a cached template with the same skeleton.
+        
+        Args:
+            text: The text being rephrased
+            
+        Returns:
+            The cached response template with this text's slot values filled in,
+            or None on a miss
+        """
+        if not self.agent_config["template_cache"]:
+            return None
+        skeleton, slots = _template_key(text)
+        if not slots:
+            return None
+        with self._cache_lock:
+            template = self._templates.get(skeleton)
+            if template is None:
+                return None
+            self._templates.move_to_end(skeleton)
+        
+        response = _TEMPLATE_SLOT_RE.sub(lambda m: slots[int(m.group(1))], template)
+        # A synthesized response that fails validation is a miss, not a fallback
+        return self._check_response(text, response)
+    
+    def _template_put(self, text: str, response: str) -> None:
+        """Register a validated response as the template for the text's skeleton.
+        
+        The response is only usable as a template if every slot value appears in
+        it exactly once as a whole word, so it can be swapped out unambiguously.
+        
+        Args:
+            text: The text that was rephrased
+            response: The validated response
+        """
+        if not self.agent_config["template_cache"]:
+            return
+        maxsize = self.agent_config["cache_size"]
+        skeleton, slots = _template_key(text)
+        if maxsize <= 0 or not slots or len(set(slots)) != len(slots):
+            return
+        
+        template = response
+        for i, slot in enumerate(slots):
+            pattern = rf"\b{re.escape(slot)}\b"
+            if len(re.findall(pattern, template)) != 1:
+                return
+            template = re.sub(pattern, f"<SLOT_{i}>", template)
+        
+        with self._cache_lock:
+            self._templates[skeleton] = template
+            self._templates.move_to_end(skeleton)
+            while len(self._templates) > maxsize:
+                self._templates.popitem(last=False)
+    
+    @classmethod
+    def _missing_words(cls, original_text: str, response: str) -> FrozenSet[str]:
+        """Return the words of the original text that are missing from the response (case insensitive)."""
+        return frozenset(_tokenize_original(original_text)) - cls._response_words(response)
+    
+    @staticmethod
+    def _response_words(response: str) -> FrozenSet[str]:
+        """Return the set of lowercase words in a response, ignoring emojis."""
+        return frozenset(_split_words(response.lower()))
+    
+    def _check_response(self, original_text: str, response: str) -> Optional[str]:
+        """Check the response quality and remove inappropriate emojis.
+        
+        Args:
+            original_text: The original text input by the user
+            response: The response from the agent
+            
+        Returns:
+            The cleaned response, or None if it fails validation
+        """
+        # Derive the length, word and emoji counts once, up front
+        original_len = len(original_text)
+        response_len = len(response)
         word_count = len(original_text.split())
-        emoji_count = len(emojis)
+        emoji_count = _count_emojis(response)
         
+        # Check if response is too short or has no emojis
+        if response_len < original_len / 2 or not emoji_count:
+            if emoji_count:
+                logger.warning(f"Response too short: {response}")
+            else:
+                logger.warning("Response doesn't contain any emojis")
+            return None
+            
+        # Check if all original words are preserved (case insensitive)
+        missing_words = self._missing_words(original_text, response)
+        if missing_words:
+            logger.warning(f"Missing words in response: {', '.join(sorted(missing_words))}")
+            return None
+        
+        # Remove potentially negative or inappropriate emojis in a single pass
+        response, removed = _NEG_RE.subn('', response)
+        if removed:
+            logger.warning(f"Removed {removed} potentially negative emoji(s) from response")
+            response = response.strip()
+            emoji_count = _count_emojis(response)
+            if not emoji_count:
+                logger.warning("Response has no emojis left after removing negative ones")
+                return None
+        
+        # Check for excessive emojis (more than 1 emoji per 3 words)
         if emoji_count > word_count / 2 + 2:  # Allow some extra emojis, but not too many
             logger.warning(f"Response contains too many emojis: {emoji_count} emojis for {word_count} words")
             # Keep the response but log the warning - we don't want to be too strict
@@ -230,17 +1035,20 @@ class EmojiRephraserAgent:
         # If the response contains explanatory text, try to extract just the emojis
         # This is a simple heuristic and might need adjustment
         if len(cleaned) > 100:  # If response is very long, it probably contains text
-            import re
             # Try to extract emoji sequences
-            emoji_pattern = r'[\U0001F000-\U0001F9FF\u2600-\u26FF\u2700-\u27BF]+'
-            emojis = re.findall(emoji_pattern, cleaned)
+            emojis = _extract_emojis(cleaned)
             if emojis:
                 return ''.join(emojis)
         
         return cleaned
     
-    def shutdown(self):
+    def shutdown(self) -> None:
         """Clean up resources."""
         logger.info("Shutting down Emoji Rephraser Agent")
-        # Perform any necessary cleanup for the Strands agent
-        self.agent = None
\ No newline at end of file
+        # Perform any necessary cleanup for the Strands models
+        self.model = None
+        self._fast_model = None
+        with self._cache_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
\ No newline at end of file
@@ -1,27 +1,60 @@
-from setuptools import setup, find_packages
+import os
+import shutil
 
+from setuptools import setup
+from setuptools.command.build_py import build_py
+
+# Modules compiled to C extensions with mypyc, when it is available
+COMPILED_MODULES = ["rephraser.py", "terminal.py"]
+
+# The repository root is the emoji_rephraser package itself, but mypy names
+# modules after the directory they are in, which is whatever the checkout is
+# called. The sources are copied into a directory named after the package first.
+STAGING_DIR = os.path.join("build", "mypyc_src", "emoji_rephraser")
+
+
+def _mypyc_extensions():
+    """Build the mypyc extensions, or return none to install pure Python.
+
+    The extensions are optional, so a failing C compiler also falls back to
+    the pure-Python modules instead of failing the install.
+    """
+    try:
+        from mypyc.build import mypycify
+    except ImportError:
+        return []
+
+    os.makedirs(STAGING_DIR, exist_ok=True)
+    for name in ["__init__.py"] + COMPILED_MODULES:
+        shutil.copy2(name, STAGING_DIR)
+    try:
+        # Without namespace packages, mypy stops looking for parent packages at
+        # the first directory without an __init__.py, i.e. above the staged copy
+        extensions = mypycify(
+            ["--no-namespace-packages"]
+            + [os.path.join(STAGING_DIR, name) for name in COMPILED_MODULES]
+        )
+    except (Exception, SystemExit) as e:
+        # mypy reports errors by exiting, so SystemExit is caught as well
+        print(f"mypyc compilation skipped: {e}")
+        return []
+    for extension in extensions:
+        extension.optional = True
+    return extensions
+
+
+class BuildPy(build_py):
+    """Leave setup.py itself out of the emoji_rephraser package."""
+
+    def find_package_modules(self, package, package_dir):
+        modules = super().find_package_modules(package, package_dir)
+        return [m for m in modules if m[1] != "setup"]
+
+
+# Project metadata and dependencies are declared in pyproject.toml
 setup(
-    name="emoji_rephraser",
-    version="0.1.0",
-    packages=find_packages(),
-    install_requires=[
-        "strands-agents>=1.0.0",
-    ],
-    python_requires=">=3.8",
-    entry_points={
-        "console_scripts": [
-            "emoji-rephraser=emoji_rephraser.main:main",
-        ],
-    },
-    author="Emoji Rephraser Team",
-    author_email="your.email@example.com",
-    description="A command-line application that enhances text with emojis",
-    long_description=open("README.md").read(),
-    long_description_content_type="text/markdown",
-    url="https://github.com/yourusername/emoji-rephraser",
-    classifiers=[
-        "Programming Language :: Python :: 3",
-        "License :: OSI Approved :: MIT License",
-        "Operating System :: OS Independent",
-    ],
-)
\ No newline at end of file
+    packages=["emoji_rephraser"],
+    package_dir={"emoji_rephraser": "."},
+    ext_modules=_mypyc_extensions(),
+    cmdclass={"build_py": BuildPy},
+)
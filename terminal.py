@@ -3,22 +3,61 @@ Terminal Interface for Emoji Rephraser
 
 Handles user interaction through the terminal.
 """
+import itertools
 import os
 import sys
-import time
+import threading
 
 
 class TerminalInterface:
     """Manages terminal-based user interaction."""
     
-    def __init__(self):
+    HELP_MESSAGE = """
+        📚 Help Information 📚
+        
+        - Type any text to get it enhanced with emojis
+        - The rephraser will add emojis while preserving your original words
+        - Commands:
+          - exit, quit, bye, q: Exit the application
+          - help, ?, h: Display this help information
+          - clear, cls: Clear the screen
+        
+        Happy rephrasing! 😊
+        """
+    
+    def __init__(self) -> None:
         """Initialize the terminal interface."""
         self.exit_commands = ['exit', 'quit', 'bye', 'q']
         self.help_commands = ['help', '?', 'h']
+        self.clear_commands = ['clear', 'cls']
+        # Map each command to its action so input is dispatched with a single lookup
+        self._dispatch = {
+            **{cmd: 'EXIT' for cmd in self.exit_commands},
+            **{cmd: 'HELP' for cmd in self.help_commands},
+            **{cmd: 'CLEAR' for cmd in self.clear_commands},
+        }
         # Check if terminal supports emojis
         self.emoji_support = self._check_emoji_support()
+        self._is_tty = sys.stdout.isatty()
+        
+        # Precompute emoji-dependent strings once instead of on every call
+        # Use simpler symbols if emoji support is questionable
+        if self.emoji_support:
+            self._star, self._rocket, self._wave = "✨", "🚀", "👋"
+            self._prompt = "\n🗣️  Enter text to rephrase: "
+            self._reph_prefix = "\n🔄 Rephrased: "
+            self._corr_prefix = "\n🔄 Corrected: "
+            self._err_prefix = "\n❌ Error: "
+            self._help_message = self.HELP_MESSAGE
+        else:
+            self._star, self._rocket, self._wave = "*", ">", "!"
+            self._prompt = "\n> Enter text to rephrase: "
+            self._reph_prefix = "\n=> Rephrased: "
+            self._corr_prefix = "\n=> Corrected: "
+            self._err_prefix = "\n[ERROR] Error: "
+            self._help_message = self.HELP_MESSAGE.replace('📚', '#').replace('😊', ':)')
         
-    def _check_emoji_support(self):
+    def _check_emoji_support(self) -> bool:
         """Check if the terminal supports emoji display."""
         # Simple check based on platform and environment
         # This is a basic check and might not be 100% accurate
@@ -26,18 +65,15 @@ class TerminalInterface:
             return 'WT_SESSION' in os.environ or 'CMDER_ROOT' in os.environ
         return True  # Most Unix-based terminals support emojis
     
-    def clear_screen(self):
+    def clear_screen(self) -> None:
         """Clear the terminal screen."""
         os.system('cls' if os.name == 'nt' else 'clear')
     
-    def display_welcome(self):
+    def display_welcome(self) -> None:
         """Display welcome message and instructions."""
         self.clear_screen()
         
-        # Use simpler symbols if emoji support is questionable
-        star = "✨" if self.emoji_support else "*"
-        rocket = "🚀" if self.emoji_support else ">"
-        
+        star = self._star
         welcome_message = f"""
         {star} Welcome to Emoji Rephraser! {star}
         
@@ -45,39 +81,27 @@ class TerminalInterface:
         Type '{self.exit_commands[0]}' to exit the application.
         Type '{self.help_commands[0]}' for instructions.
         
-        Let's start rephrasing! {rocket}
+        Let's start rephrasing! {self._rocket}
         """
         print(welcome_message)
     
-    def display_help(self):
+    def display_help(self) -> None:
         """Display help information."""
-        help_message = """
-        📚 Help Information 📚
-        
-        - Type any text to get it enhanced with emojis
-        - The rephraser will add emojis while preserving your original words
-        - Commands:
-          - exit, quit, bye, q: Exit the application
-          - help, ?, h: Display this help information
-          - clear, cls: Clear the screen
-        
-        Happy rephrasing! 😊
-        """
-        print(help_message if self.emoji_support else help_message.replace('📚', '#').replace('😊', ':)'))
+        print(self._help_message)
     
-    def get_user_input(self):
+    def get_user_input(self) -> str:
         """Get input from the user."""
         try:
-            prompt = "\n🗣️  " if self.emoji_support else "\n> "
-            user_input = input(f"{prompt}Enter text to rephrase: ").strip()
+            user_input = input(self._prompt).strip()
             
             # Handle special commands
-            if user_input.lower() in self.exit_commands:
+            command = self._dispatch.get(user_input.lower())
+            if command == 'EXIT':
                 return "EXIT"
-            elif user_input.lower() in self.help_commands:
+            elif command == 'HELP':
                 self.display_help()
                 return ""
-            elif user_input.lower() in ['clear', 'cls']:
+            elif command == 'CLEAR':
                 self.clear_screen()
                 return ""
                 
@@ -89,40 +113,64 @@ class TerminalInterface:
             print("\nDetected EOF. Exiting...")
             return "EXIT"
     
-    def display_rephrasing(self, rephrased_text):
+    def display_rephrasing(self, rephrased_text: str) -> None:
         """Display emoji rephrased text to the user."""
         if not rephrased_text:
             self.display_error("No rephrasing available")
             return
             
-        prefix = "\n🔄 " if self.emoji_support else "\n=> "
-        print(f"{prefix}Rephrased: {rephrased_text}")
+        print(f"{self._reph_prefix}{rephrased_text}")
     
-    def display_error(self, message):
+    def begin_stream(self) -> None:
+        """Start displaying a rephrasing that arrives in chunks."""
+        print(self._reph_prefix, end="", flush=True)
+    
+    def write_chunk(self, chunk: str) -> None:
+        """Display the next chunk of a streamed rephrasing."""
+        print(chunk, end="", flush=True)
+    
+    def end_stream(self) -> None:
+        """Finish displaying a streamed rephrasing."""
+        print()
+    
+    def display_correction(self, rephrased_text: str) -> None:
+        """Display the validated rephrasing in place of a streamed one that it changed."""
+        if not rephrased_text:
+            self.display_error("No rephrasing available")
+            return
+        
+        print(f"{self._corr_prefix}{rephrased_text}")
+    
+    def display_error(self, message: str) -> None:
         """Display error message."""
-        prefix = "\n❌ " if self.emoji_support else "\n[ERROR] "
-        print(f"{prefix}Error: {message}")
+        print(f"{self._err_prefix}{message}")
     
-    def display_message(self, message):
+    def display_message(self, message: str) -> None:
         """Display a general message."""
         print(f"\n{message}")
+    
+    def display_goodbye(self) -> None:
+        """Display the goodbye message."""
+        self.display_message(f"Thank you for using Emoji Rephraser! Goodbye{self._wave}")
+        
+    def display_loading_live(self, done_event: threading.Event, message: str = "Rephrasing") -> None:
+        """Display a spinner until done_event is set.
         
-    def display_loading(self, message="Rephrasing"):
-        """Display a loading animation."""
-        if not sys.stdout.isatty():
+        Intended to run on a background thread while the rephrasing request
+        is in flight, so the animation adds no latency of its own.
+        """
+        if not self._is_tty:
             print(f"{message}...")
             return
+        
+        for frame in itertools.cycle('|/-\\'):
+            print(f"\r{frame} {message}", end="", flush=True)
+            if done_event.wait(0.1):
+                break
+        # Erase the spinner line
+        print("\r" + " " * (len(message) + 2) + "\r", end="", flush=True)
             
-        try:
-            print(f"{message}", end="", flush=True)
-            for _ in range(3):
-                time.sleep(0.3)
-                print(".", end="", flush=True)
-            print()  # New line after loading
-        except KeyboardInterrupt:
-            print("\nOperation cancelled")
-            
-    def confirm_exit(self):
+    def confirm_exit(self) -> bool:
         """Confirm if the user wants to exit."""
         try:
             response = input("\nAre you sure you want to exit? (y/n): ").strip().lower()
@@ -0,0 +1,108 @@
+"""Shared fixtures: a stub Strands SDK and the package loaded from this checkout."""
+import importlib.machinery
+import importlib.util
+import pathlib
+import sys
+import types
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+
+def _stub_module(name, **attrs):
+    """Create a module that importlib.util.find_spec can see in sys.modules."""
+    module = types.ModuleType(name)
+    module.__spec__ = importlib.machinery.ModuleSpec(name, None)
+    module.__dict__.update(attrs)
+    sys.modules[name] = module
+    return module
+
+
+class StubAgent:
+    """Stand-in for strands.Agent that answers with StubAgent.respond(text)."""
+
+    prompts = []
+    chunks = None
+
+    def __init__(self, model=None, system_prompt=None, callback_handler=None):
+        self.model = model
+
+    @staticmethod
+    def respond(text):
+        return f"{text} 🍕"
+
+    def _reply(self, prompt):
+        StubAgent.prompts.append(prompt)
+        return StubAgent.respond(prompt.split(": ", 1)[1])
+
+    def __call__(self, prompt):
+        return self._reply(prompt)
+
+    async def invoke_async(self, prompt):
+        return self._reply(prompt)
+
+    async def stream_async(self, prompt):
+        response = self._reply(prompt)
+        for chunk in StubAgent.chunks or [response]:
+            yield {"data": chunk}
+
+
+class StubBedrockModel:
+    """Stand-in for strands.models.BedrockModel."""
+
+    def __init__(self, **config):
+        self.config = config
+
+    def get_config(self):
+        return self.config
+
+
+class StubConfig:
+    """Stand-in for botocore.config.Config."""
+
+    def __init__(self, **options):
+        self.options = options
+
+
+# The Strands SDK is always stubbed, so the tests never reach Bedrock
+_stub_module("strands", Agent=StubAgent)
+_stub_module("strands.models", BedrockModel=StubBedrockModel)
+if importlib.util.find_spec("botocore") is None:
+    _stub_module("botocore")
+    _stub_module("botocore.config", Config=StubConfig)
+
+# The repository root is the emoji_rephraser package, whatever the checkout is called
+_spec = importlib.util.spec_from_file_location(
+    "emoji_rephraser", ROOT / "__init__.py", submodule_search_locations=[str(ROOT)]
+)
+_package = importlib.util.module_from_spec(_spec)
+sys.modules["emoji_rephraser"] = _package
+_spec.loader.exec_module(_package)
+
+
+@pytest.fixture
+def stub_agent(monkeypatch):
+    """The stub Agent class, reset for each test."""
+    monkeypatch.setattr(StubAgent, "prompts", [])
+    monkeypatch.setattr(StubAgent, "chunks", None)
+    return StubAgent
+
+
+@pytest.fixture
+def make_rephraser(stub_agent, tmp_path):
+    """Build EmojiRephraserAgent instances that persist to a per-test database."""
+    from emoji_rephraser.rephraser import EmojiRephraserAgent
+
+    agents = []
+
+    def make(**config):
+        config.setdefault("cache_path", str(tmp_path / "cache.db"))
+        config.setdefault("fast_model_id", None)
+        agent = EmojiRephraserAgent(config)
+        agents.append(agent)
+        return agent
+
+    yield make
+    for agent in agents:
+        agent.shutdown()
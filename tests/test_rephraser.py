@@ -0,0 +1,151 @@
+"""Behavior tests for emoji_rephraser.rephraser."""
+import sqlite3
+
+import pytest
+
+from emoji_rephraser.rephraser import (
+    EmojiRephraserAgent,
+    _filter_negative_emojis,
+    _split_words,
+    _template_key,
+)
+
+LONG_TEXT = "This is a long sentence. It has several parts. And it is long enough to skip routing."
+
+
+def _drain(stream):
+    """Collect the chunks and the return value of a rephrase_stream generator."""
+    chunks = []
+    while True:
+        try:
+            chunks.append(next(stream))
+        except StopIteration as stop:
+            return chunks, stop.value
+
+
+def _fail(text):
+    raise AssertionError(f"model called for {text!r}")
+
+
+def test_filter_negative_emojis_removes_complete_emojis():
+    assert _filter_negative_emojis("I love 💀pizza 🤬") == ("I love pizza ", "")
+
+
+def test_filter_negative_emojis_holds_back_partial_emoji():
+    safe, held = _filter_negative_emojis("Pirates ☠")
+    assert (safe, held) == ("Pirates ", "☠")
+    # The next chunk completes it as '☠️', which is removed
+    assert _filter_negative_emojis(held + "️ ahoy") == (" ahoy", "")
+
+
+def test_filter_negative_emojis_releases_uncompleted_prefix():
+    assert _filter_negative_emojis("☠" + " ahoy") == ("☠ ahoy", "")
+
+
+def test_rephrase_stream_filters_negative_emoji_split_across_chunks(make_rephraser, stub_agent):
+    stub_agent.chunks = [LONG_TEXT + " ☠", "️ 🍕"]
+    chunks, result = _drain(make_rephraser().rephrase_stream(LONG_TEXT))
+
+    assert "☠" not in "".join(chunks)
+    assert "".join(chunks) == result
+
+
+def test_check_response_rejects_response_left_without_emojis():
+    agent = EmojiRephraserAgent.__new__(EmojiRephraserAgent)
+    assert agent._check_response("I love pizza", "I love pizza 💀") is None
+    assert agent._check_response("I love pizza", "I love pizza 🍕 💀") == "I love pizza 🍕"
+
+
+@pytest.mark.parametrize("original, response", [
+    ("I love 🍕", "I ❤️ love 🍕 pizza"),
+    ("You are a star", "You are a star⭐ ✨"),
+    ("I love you", "I love you🫶 ❤️"),
+    ("Don't stop", "Don’t stop 🎶"),
+    ("Wait...", "Wait… ⏳"),
+])
+def test_missing_words_ignores_emojis_and_typographic_punctuation(original, response):
+    assert EmojiRephraserAgent._missing_words(original, response) == frozenset()
+
+
+def test_missing_words_reports_dropped_words():
+    assert EmojiRephraserAgent._missing_words("I love pizza", "I love 🍕") == {"pizza"}
+
+
+@pytest.mark.parametrize("text, response", [
+    ("The man bit the dog", "The dog 🐕 bit the man"),
+    ("Is it done?", "It is done. ✅"),
+    ("I LOVE PIZZA", "I love pizza 🍕"),
+])
+def test_split_words_keeps_order_and_case(text, response):
+    assert _split_words(text) != _split_words(response)
+
+
+def test_fast_model_error_falls_back_to_main_model(make_rephraser, stub_agent, monkeypatch):
+    agent = make_rephraser(fast_model_id="fast-model")
+    called = []
+    original_call = stub_agent.__call__
+
+    def call(self, prompt):
+        called.append(self.model.config["model_id"])
+        if self.model.config["model_id"] == "fast-model":
+            raise RuntimeError("throttled")
+        return original_call(self, prompt)
+
+    monkeypatch.setattr(stub_agent, "__call__", call)
+    assert agent.rephrase("I love pizza") == "I love pizza 🍕"
+    assert called == ["fast-model", agent.agent_config["model_id"]]
+
+
+def test_template_key_keeps_fixed_words():
+    assert _template_key("I love pizza") == ("I love <SLOT_0>", ("pizza",))
+    assert _template_key("We LOVE Tacos") == ("We LOVE <SLOT_0>", ("Tacos",))
+
+
+def test_template_cache_fills_slots_of_cached_response(make_rephraser, stub_agent, monkeypatch):
+    agent = make_rephraser(template_cache=True)
+    assert agent.rephrase("I love pizza") == "I love pizza 🍕"
+
+    monkeypatch.setattr(stub_agent, "respond", staticmethod(_fail))
+    assert agent.rephrase("I love tacos") == "I love tacos 🍕"
+
+
+def test_template_put_skips_ambiguous_slots(make_rephraser):
+    agent = make_rephraser(template_cache=True)
+    agent._template_put("I love pizza", "I love pizza 🍕 pizza")
+    agent._template_put("pizza and pizza", "pizza and pizza 🍕")
+    assert not agent._templates
+
+
+def test_persisted_cache_is_reused_under_same_config(make_rephraser, stub_agent, monkeypatch):
+    make_rephraser().rephrase("I love pizza")
+
+    monkeypatch.setattr(stub_agent, "respond", staticmethod(_fail))
+    assert make_rephraser().rephrase("I love pizza") == "I love pizza 🍕"
+
+
+def test_persisted_cache_is_scoped_to_generation_config(make_rephraser, stub_agent, monkeypatch):
+    make_rephraser().rephrase("I love pizza")
+
+    monkeypatch.setattr(stub_agent, "respond", staticmethod(lambda text: f"{text} 🌮"))
+    assert make_rephraser(temperature=0.2).rephrase("I love pizza") == "I love pizza 🌮"
+    assert make_rephraser(system_prompt="Add emojis.").rephrase("I love pizza") == "I love pizza 🌮"
+
+
+def test_persisted_cache_keys_are_case_sensitive(make_rephraser, stub_agent):
+    make_rephraser().rephrase("I love pizza")
+    assert make_rephraser().rephrase("I LOVE PIZZA") == "I LOVE PIZZA 🍕"
+    assert len(stub_agent.prompts) == 2
+
+
+def test_rejected_response_is_not_cached(make_rephraser, stub_agent, monkeypatch, tmp_path):
+    monkeypatch.setattr(stub_agent, "respond", staticmethod(lambda text: "nope 🍕"))
+    assert make_rephraser().rephrase(LONG_TEXT) == LONG_TEXT + " 👍"
+
+    with sqlite3.connect(tmp_path / "cache.db") as db:
+        assert db.execute("SELECT COUNT(*) FROM responses").fetchone() == (0,)
+
+
+def test_cache_path_expands_user(make_rephraser, monkeypatch, tmp_path):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    make_rephraser(cache_path="~/cache/responses.db").rephrase("I love pizza")
+    assert (tmp_path / "cache" / "responses.db").exists()
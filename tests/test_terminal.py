@@ -0,0 +1,30 @@
+"""Behavior tests for emoji_rephraser.terminal."""
+import pytest
+
+from emoji_rephraser.terminal import TerminalInterface
+
+
+@pytest.fixture
+def terminal(monkeypatch):
+    monkeypatch.setattr(TerminalInterface, "_check_emoji_support", lambda self: False)
+    return TerminalInterface()
+
+
+def test_display_correction_labels_validated_text(terminal, capsys):
+    terminal.display_correction("I love pizza 👍")
+    assert capsys.readouterr().out == "\n=> Corrected: I love pizza 👍\n"
+
+
+def test_display_correction_without_text_shows_error(terminal, capsys):
+    terminal.display_correction("")
+    assert "No rephrasing available" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("q", "EXIT"),
+    ("  Help  ", ""),
+    ("I love pizza", "I love pizza"),
+])
+def test_get_user_input_dispatches_commands(terminal, monkeypatch, text, expected):
+    monkeypatch.setattr("builtins.input", lambda prompt: text)
+    assert terminal.get_user_input() == expected